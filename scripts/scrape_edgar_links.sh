@@ -32,13 +32,12 @@ python3 - <<PY
 from pathlib import Path
 import sys
 try:
-    from src.data_extraction.scrape_edgar_links import EdgarLinksProcessor
+    from src.data_extraction.scrape_edgar_links import EdgarLinksProcessor, format_result
     base = Path("$ROOT_DIR")
     xlsx_path = Path("$XLSX_PATH")
     processor = EdgarLinksProcessor(base)
     res = processor.process_file(xlsx_path)
-    details = ", ".join([f"{k}:{v}" for k,v in res.items() if k.startswith("error_") or k.startswith("saved_")])
-    print(f"Processed: {xlsx_path.name} -> {res.get('status')}\n  Details: {details}")
+    print(format_result(xlsx_path.name, res))
 except Exception as e:
     print(f"Error: {e}")
     sys.exit(2)
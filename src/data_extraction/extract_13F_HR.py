@@ -1,161 +1,351 @@
+import csv
+import importlib.util
+import mmap
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple, Union
 
 try:
     import pandas as pd  # type: ignore
 except Exception:
     pd = None
 
+# Excel engine, chosen once at import. xlsxwriter streams rows straight into
+# the zip container instead of building a cell object per value like openpyxl.
+EXCEL_ENGINE = next(
+    (engine for engine in ("xlsxwriter", "openpyxl") if importlib.util.find_spec(engine) is not None),
+    None,
+)
+# Without pandas or any engine, WorkbookWriter falls back to CSV files
+HAS_XLSX = pd is not None and EXCEL_ENGINE is not None
+
+try:
+    from lxml import etree as LET  # type: ignore
+except Exception:
+    LET = None
+
 import xml.etree.ElementTree as ET
+from io import BytesIO
+from pathlib import Path
 
 INFORMATION_TABLE_NS = "http://www.sec.gov/edgar/document/thirteenf/informationtable"
-NS = {"it": INFORMATION_TABLE_NS}
+
+INFOTABLE_COLUMNS = [
+    "issuer_name",
+    "class_title",
+    "cusip",
+    "value_usd_quarter_end",
+    "shares_or_principal",
+    "shares_type",
+    "discretion",
+    "other_manager_seq",
+    "vote_sole",
+    "vote_shared",
+    "vote_none",
+]
+INFOTABLE_INT_COLUMNS = [
+    "value_usd_quarter_end",
+    "shares_or_principal",
+    "other_manager_seq",
+    "vote_sole",
+    "vote_shared",
+    "vote_none",
+]
+
+# Clark-form tags ("{namespace}local") so InfoTable rows can be matched on
+# Element.tag directly instead of expanding "it:" ElementPath prefixes per call
+_NS = "{" + INFORMATION_TABLE_NS + "}"
+_TAG_INFOTABLE = _NS + "infoTable"
+_TAG_ISSUER = _NS + "nameOfIssuer"
+_TAG_CLASS = _NS + "titleOfClass"
+_TAG_CUSIP = _NS + "cusip"
+_TAG_VALUE = _NS + "value"
+_TAG_SHRS = _NS + "shrsOrPrnAmt"
+_TAG_SHRS_AMT = _NS + "sshPrnamt"
+_TAG_SHRS_TYPE = _NS + "sshPrnamtType"
+_TAG_DISCRETION = _NS + "investmentDiscretion"
+_TAG_OTHER_MANAGER = _NS + "otherManager"
+_TAG_VOTING = _NS + "votingAuthority"
+_TAG_VOTE_SOLE = _NS + "Sole"
+_TAG_VOTE_SHARED = _NS + "Shared"
+_TAG_VOTE_NONE = _NS + "None"
+
+_RE_CONFORMED_PERIOD = re.compile(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})")
+_RE_PERIOD_OF_REPORT = re.compile(r"<periodOfReport>(\d{2}-\d{2}-\d{4})</periodOfReport>")
+_RE_REPORT_CALENDAR = re.compile(r"<reportCalendarOrQuarter>(\d{2}-\d{2}-\d{4})</reportCalendarOrQuarter>")
+_RE_FILED_AS_OF = re.compile(r"FILED\s+AS\s+OF\s+DATE:\s*(\d{8})")
+_RE_NON_INT = re.compile(r"[^0-9\-]")
+# Section markers of a submission. The literal ones are located with
+# bytes.find (C fast-search); only the case-insensitive <TYPE> lines need regex.
+_HEADER_START = b"<SEC-HEADER>"
+_HEADER_END = b"</SEC-HEADER>"
+_INFOTABLE_FILENAME = b"<FILENAME>form13fInfoTable.xml"
+_INFOTABLE_START = b"<informationTable"
+_INFOTABLE_END = b"</informationTable>"
+_RE_TYPE_13FHR = re.compile(rb"<TYPE>\s*13F-HR\b", re.IGNORECASE)
+_RE_TYPE_INFOTABLE = re.compile(rb"<TYPE>\s*INFORMATION TABLE\b", re.IGNORECASE)
+# One SEC-HEADER line: (leading indent, content without surrounding whitespace)
+_RE_HDR_LINE = re.compile(r"^([\t ]*)([^\r\n]*?\S)[\t \r]*$", re.MULTILINE)
+# One 13F-HR block line, classified by the named alternative that matched
+# (tried in order): inline XML value, bare XML tag (ignored), checkbox,
+# "field: value" pair, or free text. Lines are trimmed by the outer anchors.
+_RE_TYPE_LINE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<xml><(?P<xml_tag>[A-Za-z0-9]+)>(?P<xml_value>[^\r\n]*?)</(?P=xml_tag)>(?=[ \t\r]*$))"
+    r"|(?P<tag></?[A-Za-z0-9]+>)"
+    r"|(?P<checkbox>(?P<cb_field>[^\r\n]*?)(?P<cb_box>\[[ \t]*[Xx][ \t]*\]|\[[ \t]*\]))"
+    r"|(?P<pair>(?P<pair_field>[^:\r\n]*):(?P<pair_value>[^\r\n]*))"
+    r"|(?P<text>[^\r\n]*\S)"
+    r")[^\r\n]*",
+    re.MULTILINE,
+)
+
+_FIELD_FLAGS = re.IGNORECASE | re.MULTILINE
+# FilingData fields in output order, each with the header label pattern that
+# captures its value. Business_Address is composed from its own block.
+_FILING_FIELDS = [
+    ("Accession_Number", r"ACCESSION NUMBER:[ \t]*([0-9\-]+)"),
+    ("Submission_Type", r"CONFORMED SUBMISSION TYPE:[ \t]*([A-Z0-9\-]+)"),
+    ("Period_of_Report", r"CONFORMED PERIOD OF REPORT:[ \t]*(\d{8})"),
+    ("Filed_Date", r"FILED AS OF DATE:[ \t]*(\d{8})"),
+    ("Filer_Name", r"COMPANY CONFORMED NAME:[ \t]*(.+)"),
+    ("CIK", r"CENTRAL INDEX KEY:[ \t]*(\d+)"),
+    # SIC may appear like: STANDARD INDUSTRIAL CLASSIFICATION: [desc] [6211]
+    ("SIC", r"STANDARD INDUSTRIAL CLASSIFICATION:[ \t]*.*\[(\d+)\]"),
+    ("IRS_Number", r"IRS NUMBER:[ \t]*(\d+)"),
+    ("State_of_Incorporation", r"STATE OF INCORPORATION:[ \t]*([A-Z]{2})"),
+    ("Fiscal_Year_End", r"FISCAL YEAR END:[ \t]*(\d{4})"),
+    ("Business_Address", None),
+    ("Business_Phone", r"BUSINESS PHONE:[ \t]*([^\n]+)"),
+    ("SEC_File_Number", r"SEC FILE NUMBER:[ \t]*([0-9\-]+)"),
+    ("Film_Number", r"FILM NUMBER:[ \t]*(\d+)"),
+    ("Former_Name", r"FORMER CONFORMED NAME:[ \t]*(.+)"),
+    ("Former_Name_Change_Date", r"DATE OF NAME CHANGE:[ \t]*(\d{8})"),
+    # Fallback for SIC when the bracketed classification is absent
+    ("SIC_Plain", r"SIC:[ \t]*(\d+)"),
+]
+# All field patterns as one alternation, so the header is scanned once. Each
+# named alternative wraps exactly one value group, found at lastindex + 1.
+_FILING_ALL = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _FILING_FIELDS if pattern),
+    _FIELD_FLAGS,
+)
+_FILING_OUTPUT = [name for name, _ in _FILING_FIELDS if name != "SIC_Plain"]
+_RE_ADDR_STREET = re.compile(r"BUSINESS ADDRESS:\s*[\r\n]+\s*STREET 1:\s*(.+)", _FIELD_FLAGS)
+_RE_ADDR_CITY = re.compile(r"BUSINESS ADDRESS:.*?[\r\n]+\s*CITY:\s*(.+)", _FIELD_FLAGS)
+_RE_ADDR_STATE = re.compile(r"BUSINESS ADDRESS:.*?[\r\n]+\s*STATE:\s*([A-Z]{2})", _FIELD_FLAGS)
+_RE_ADDR_ZIP = re.compile(r"BUSINESS ADDRESS:.*?[\r\n]+\s*ZIP:\s*(\d{5}(?:-\d{4})?)", _FIELD_FLAGS)
+
+
+class SubmissionSplitter:
+    @staticmethod
+    def split(data: Union[bytes, mmap.mmap]) -> Dict[str, Optional[Union[str, bytes]]]:
+        # Slice the SEC header, 13F-HR type block and InfoTable XML out of the
+        # raw submission. Sections appear in file order, so each search starts
+        # where the previous section ended and the file is walked about once.
+        # Only the short header/type slices are decoded; the XML stays bytes.
+        pos = 0
+        header = None
+        header_start = data.find(_HEADER_START)
+        if header_start >= 0:
+            header_end = data.find(_HEADER_END, header_start + len(_HEADER_START))
+            if header_end >= 0:
+                header = data[header_start + len(_HEADER_START):header_end].decode("utf-8", "ignore").strip()
+                pos = header_end + len(_HEADER_END)
+
+        type_block = None
+        m_start = _RE_TYPE_13FHR.search(data, pos)
+        if m_start:
+            m_end = _RE_TYPE_INFOTABLE.search(data, m_start.end())
+            end_pos = m_end.start() if m_end else m_start.end()
+            type_block = data[m_start.end():end_pos].decode("utf-8", "ignore").strip() or None
+            pos = end_pos
+
+        return {
+            "header": header,
+            "type_block": type_block,
+            "info_xml": SubmissionSplitter._find_info_xml(data, pos),
+        }
+
+    @staticmethod
+    def _find_info_xml(data: Union[bytes, mmap.mmap], pos: int) -> Optional[bytes]:
+        # Prefer the table inside the form13fInfoTable.xml document, else the
+        # first table anywhere in the file
+        named = data.find(_INFOTABLE_FILENAME, pos)
+        candidates = ([named] if named >= 0 else []) + [0]
+        for start_from in candidates:
+            start = data.find(_INFOTABLE_START, start_from)
+            if start < 0:
+                continue
+            end = data.find(_INFOTABLE_END, start)
+            if end >= 0:
+                # Drop stray non-UTF-8 bytes (e.g. Latin-1 issuer names) as the
+                # whole-file errors="ignore" read did; only the table is copied
+                return data[start:end + len(_INFOTABLE_END)].decode("utf-8", "ignore").encode()
+        return None
 
 
 class FilingDateResolver:
     @staticmethod
-    def parse_date(text: str) -> str:
-        m = re.search(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", text)
+    def parse_date(header_text: Optional[str], type_block: Optional[str] = None) -> str:
+        header_text = header_text or ""
+        type_block = type_block or ""
+        m = _RE_CONFORMED_PERIOD.search(header_text)
         if m:
             return m.group(1)
-        m = re.search(r"<periodOfReport>(\d{2}-\d{2}-\d{4})</periodOfReport>", text)
-        if m:
-            dt = datetime.strptime(m.group(1), "%m-%d-%Y")
-            return dt.strftime("%Y%m%d")
-        m = re.search(r"<reportCalendarOrQuarter>(\d{2}-\d{2}-\d{4})</reportCalendarOrQuarter>", text)
+        m = _RE_PERIOD_OF_REPORT.search(type_block) or _RE_REPORT_CALENDAR.search(type_block)
         if m:
-            dt = datetime.strptime(m.group(1), "%m-%d-%Y")
-            return dt.strftime("%Y%m%d")
-        m = re.search(r"FILED\s+AS\s+OF\s+DATE:\s*(\d{8})", text)
+            # Patterns guarantee MM-DD-YYYY, so reorder by slicing
+            mdy = m.group(1)
+            return mdy[6:10] + mdy[0:2] + mdy[3:5]
+        m = _RE_FILED_AS_OF.search(header_text)
         if m:
             return m.group(1)
         return datetime.today().strftime("%Y%m%d")
 
 
 class InfoTableExtractor:
-    def __init__(self, text: str):
-        self.text = text
+    @staticmethod
+    def _text(node: ET.Element) -> str:
+        return node.text.strip() if node.text is not None else ""
 
-    def extract_xml(self) -> Optional[str]:
-        m = re.search(
-            r"<FILENAME>form13fInfoTable\.xml[\s\S]*?<TEXT>\s*(<informationTable[\s\S]*?</informationTable>)\s*</TEXT>",
-            self.text,
-        )
-        if m:
-            return m.group(1)
-        m = re.search(r"(<informationTable[\s\S]*?</informationTable>)", self.text)
-        if m:
-            return m.group(1)
-        return None
+    @staticmethod
+    def _row_values(it_node) -> Tuple[str, ...]:
+        # One walk over the infoTable children (two levels deep for the
+        # composite shrsOrPrnAmt/votingAuthority nodes) instead of one
+        # ElementPath lookup per field; works for lxml and ElementTree nodes
+        text_of = InfoTableExtractor._text
+        issuer = class_title = cusip = value = shares = shares_type = ""
+        discretion = other_manager = vote_sole = vote_shared = vote_none = ""
+        for child in it_node:
+            tag = child.tag
+            if tag == _TAG_ISSUER:
+                issuer = text_of(child)
+            elif tag == _TAG_CLASS:
+                class_title = text_of(child)
+            elif tag == _TAG_CUSIP:
+                cusip = text_of(child)
+            elif tag == _TAG_VALUE:
+                value = text_of(child)
+            elif tag == _TAG_SHRS:
+                for sub in child:
+                    if sub.tag == _TAG_SHRS_AMT:
+                        shares = text_of(sub)
+                    elif sub.tag == _TAG_SHRS_TYPE:
+                        shares_type = text_of(sub)
+            elif tag == _TAG_DISCRETION:
+                discretion = text_of(child)
+            elif tag == _TAG_OTHER_MANAGER:
+                other_manager = text_of(child)
+            elif tag == _TAG_VOTING:
+                for sub in child:
+                    if sub.tag == _TAG_VOTE_SOLE:
+                        vote_sole = text_of(sub)
+                    elif sub.tag == _TAG_VOTE_SHARED:
+                        vote_shared = text_of(sub)
+                    elif sub.tag == _TAG_VOTE_NONE:
+                        vote_none = text_of(sub)
+        return (issuer, class_title, cusip, value, shares, shares_type,
+                discretion, other_manager, vote_sole, vote_shared, vote_none)
 
     @staticmethod
-    def _get_text(node: ET.Element, path: str) -> str:
-        target = node.find(path, NS)
-        return (target.text or "").strip() if target is not None and target.text is not None else ""
+    def _iter_values_etree(xml: bytes) -> Iterator[Tuple[str, ...]]:
+        root = ET.fromstring(xml)
+        for it_node in root.iterfind(_TAG_INFOTABLE):
+            yield InfoTableExtractor._row_values(it_node)
 
     @staticmethod
-    def _to_int(s: str) -> Optional[int]:
-        if not s:
-            return None
-        try:
-            return int(s)
-        except ValueError:
-            digits = re.sub(r"[^0-9]", "", s)
-            return int(digits) if digits else None
+    def _iter_values_lxml(xml: bytes) -> Iterator[Tuple[str, ...]]:
+        # Stream </infoTable> end events and free each row once read, so the
+        # full holdings DOM is never resident at once
+        context = LET.iterparse(BytesIO(xml), events=("end",), tag=_TAG_INFOTABLE)
+        for _, elem in context:
+            yield InfoTableExtractor._row_values(elem)
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    def parse_rows(self, xml: bytes) -> Dict[str, List[str]]:
+        # Values are kept as raw strings; integer columns are coerced in bulk
+        # by to_dataframe. Every row has an opening and closing tag ending in
+        # "infoTable>" (prefixed or not), which sizes the lists up front.
+        n = xml.count(b"infoTable>") // 2
+        issuers = [""] * n
+        class_titles = [""] * n
+        cusips = [""] * n
+        values = [""] * n
+        shares = [""] * n
+        shares_types = [""] * n
+        discretions = [""] * n
+        other_managers = [""] * n
+        votes_sole = [""] * n
+        votes_shared = [""] * n
+        votes_none = [""] * n
+        columns = [issuers, class_titles, cusips, values, shares, shares_types,
+                   discretions, other_managers, votes_sole, votes_shared, votes_none]
+        rows = self._iter_values_lxml(xml) if LET is not None else self._iter_values_etree(xml)
+        i = 0
+        for (issuer, class_title, cusip, value, shares_amt, shares_type,
+             discretion, other_manager, vote_sole, vote_shared, vote_none) in rows:
+            if i == n:
+                # Count hint fell short; grow every column together
+                n = max(2 * n, 16)
+                for col in columns:
+                    col.extend([""] * (n - len(col)))
+            issuers[i] = issuer
+            class_titles[i] = class_title
+            cusips[i] = cusip
+            values[i] = value
+            shares[i] = shares_amt
+            shares_types[i] = shares_type
+            discretions[i] = discretion
+            other_managers[i] = other_manager
+            votes_sole[i] = vote_sole
+            votes_shared[i] = vote_shared
+            votes_none[i] = vote_none
+            i += 1
+        for col in columns:
+            del col[i:]
+        return dict(zip(INFOTABLE_COLUMNS, columns))
 
-    def parse_rows(self, xml: str) -> List[Dict[str, object]]:
-        root = ET.fromstring(xml)
-        rows: List[Dict[str, object]] = []
-        for it_node in root.findall("it:infoTable", NS):
-            issuer = self._get_text(it_node, "it:nameOfIssuer")
-            class_title = self._get_text(it_node, "it:titleOfClass")
-            cusip = self._get_text(it_node, "it:cusip")
-            value = self._get_text(it_node, "it:value")
-            shares = self._get_text(it_node, "it:shrsOrPrnAmt/it:sshPrnamt")
-            shares_type = self._get_text(it_node, "it:shrsOrPrnAmt/it:sshPrnamtType")
-            discretion = self._get_text(it_node, "it:investmentDiscretion")
-            other_manager = self._get_text(it_node, "it:otherManager")
-            vote_sole = self._get_text(it_node, "it:votingAuthority/it:Sole")
-            vote_shared = self._get_text(it_node, "it:votingAuthority/it:Shared")
-            vote_none = self._get_text(it_node, "it:votingAuthority/it:None")
-
-            rows.append({
-                "issuer_name": issuer,
-                "class_title": class_title,
-                "cusip": cusip,
-                "value_usd_quarter_end": self._to_int(value),
-                "shares_or_principal": self._to_int(shares),
-                "shares_type": shares_type,
-                "discretion": discretion,
-                "other_manager_seq": self._to_int(other_manager),
-                "vote_sole": self._to_int(vote_sole),
-                "vote_shared": self._to_int(vote_shared),
-                "vote_none": self._to_int(vote_none),
-            })
-        return rows
+    @staticmethod
+    def empty_columns() -> Dict[str, list]:
+        return {c: [] for c in INFOTABLE_COLUMNS}
 
     @staticmethod
-    def to_dataframe(rows: List[Dict[str, object]]):
+    def to_dataframe(columns: Dict[str, list]):
         if pd is None:
             return None
-        df = pd.DataFrame(rows)
-        cols = [
-            "issuer_name",
-            "class_title",
-            "cusip",
-            "value_usd_quarter_end",
-            "shares_or_principal",
-            "shares_type",
-            "discretion",
-            "other_manager_seq",
-            "vote_sole",
-            "vote_shared",
-            "vote_none",
-        ]
-        df = df[[c for c in cols if c in df.columns]]
-        return df
+        # Coerce the integer columns first so the frame is built exactly once,
+        # already in output order, with no reindex pass afterwards
+        data = dict(columns)
+        for c in INFOTABLE_INT_COLUMNS:
+            digits = pd.Series(data[c], dtype=object).str.replace(_RE_NON_INT, "", regex=True)
+            data[c] = pd.to_numeric(digits, errors="coerce").astype("Int64")
+        return pd.DataFrame(data, columns=INFOTABLE_COLUMNS, copy=False)
 
 
 class SECHeaderParser:
-    def __init__(self, text: str):
-        self.text = text
-
-    def extract_block(self) -> Optional[str]:
-        m = re.search(r"<SEC-HEADER>([\s\S]*?)</SEC-HEADER>", self.text)
-        if m:
-            return m.group(1).strip()
-        return None
-
     @staticmethod
     def parse_rows(header_text: str) -> List[Dict[str, object]]:
         rows: List[Dict[str, object]] = []
         section_stack: List[str] = []
-        for raw_line in header_text.splitlines():
-            line = raw_line.rstrip()
-            if not line:
-                continue
-            leading_ws = len(line) - len(line.lstrip(" \t"))
-            indent_level = line[:leading_ws].count("\t") + (line[:leading_ws].count(" ") // 2)
-            content = line.lstrip(" \t")
-            if content.endswith(":") and ":\t" not in content:
+        for m in _RE_HDR_LINE.finditer(header_text):
+            leading_ws, content = m.group(1), m.group(2)
+            indent_level = leading_ws.count("\t") + (leading_ws.count(" ") // 2)
+            if content[-1] == ":" and ":\t" not in content:
                 section_name = content[:-1].strip()
-                while len(section_stack) > indent_level:
-                    section_stack.pop()
-                if len(section_stack) == indent_level:
-                    section_stack.append(section_name)
-                else:
-                    section_stack = section_stack[:indent_level] + [section_name]
+                del section_stack[indent_level:]
+                section_stack.append(section_name)
                 continue
-            if ":" in content:
-                field, value = content.split(":", 1)
-                field = field.strip()
-                value = value.strip()
-                while len(section_stack) > indent_level:
-                    section_stack.pop()
+            field, sep, value = content.partition(":")
+            if sep:
+                del section_stack[indent_level:]
                 section_path = " > ".join(section_stack) if section_stack else "HEADER"
-                rows.append({"section_path": section_path, "field": field, "value": value})
+                rows.append({"section_path": section_path, "field": field.strip(), "value": value.strip()})
                 continue
             section_path = " > ".join(section_stack) if section_stack else "HEADER"
             rows.append({"section_path": section_path, "field": "_note", "value": content})
@@ -165,10 +355,7 @@ class SECHeaderParser:
     def to_dataframe(rows: List[Dict[str, object]]):
         if pd is None:
             return None
-        df = pd.DataFrame(rows)
-        cols = ["section_path", "field", "value"]
-        df = df[[c for c in cols if c in df.columns]]
-        return df
+        return pd.DataFrame(rows, columns=["section_path", "field", "value"])
 
 
 class PathUtils:
@@ -178,107 +365,75 @@ class PathUtils:
 
     @staticmethod
     def derive_issuer_from_path(input_path: str) -> str:
-        parts = os.path.normpath(input_path).split(os.sep)
-        try:
+        p = Path(input_path)
+        parts = p.parts
+        if "raw_13F_HR" in parts:
             idx = parts.index("raw_13F_HR")
-            return parts[idx + 1]
-        except Exception:
-            return os.path.basename(os.path.dirname(input_path)) or "unknown_issuer"
+            if idx + 1 < len(parts):
+                return parts[idx + 1]
+        return p.parent.name or "unknown_issuer"
 
 
 class FilingDataResolver:
     @staticmethod
-    def parse_field(header_text: str, pattern: str) -> str:
-        m = re.search(pattern, header_text, flags=re.IGNORECASE | re.MULTILINE)
+    def parse_field(header_text: str, pattern: "re.Pattern[str]") -> str:
+        m = pattern.search(header_text)
         return (m.group(1).strip() if m else "")
 
     @staticmethod
     def compose_business_address(header_text: str) -> str:
-        street = FilingDataResolver.parse_field(header_text, r"BUSINESS ADDRESS:\s*[\r\n]+\s*STREET 1:\s*(.+)")
-        city = FilingDataResolver.parse_field(header_text, r"BUSINESS ADDRESS:.*?[\r\n]+\s*CITY:\s*(.+)")
-        state = FilingDataResolver.parse_field(header_text, r"BUSINESS ADDRESS:.*?[\r\n]+\s*STATE:\s*([A-Z]{2})")
-        zip_code = FilingDataResolver.parse_field(header_text, r"BUSINESS ADDRESS:.*?[\r\n]+\s*ZIP:\s*(\d{5}(?:-\d{4})?)")
+        street = FilingDataResolver.parse_field(header_text, _RE_ADDR_STREET)
+        city = FilingDataResolver.parse_field(header_text, _RE_ADDR_CITY)
+        state = FilingDataResolver.parse_field(header_text, _RE_ADDR_STATE)
+        zip_code = FilingDataResolver.parse_field(header_text, _RE_ADDR_ZIP)
         parts = [p for p in [street, city, state, zip_code] if p]
         return ", ".join(parts)
 
     @staticmethod
     def parse(header_text: str):
-        rows = []
-        add = rows.append
-        # Top submission metadata
-        add({"Field": "Accession_Number", "Value": FilingDataResolver.parse_field(header_text, r"ACCESSION NUMBER:\s*([0-9\-]+)")})
-        add({"Field": "Submission_Type", "Value": FilingDataResolver.parse_field(header_text, r"CONFORMED SUBMISSION TYPE:\s*([A-Z0-9\-]+)")})
-        add({"Field": "Period_of_Report", "Value": FilingDataResolver.parse_field(header_text, r"CONFORMED PERIOD OF REPORT:\s*(\d{8})")})
-        add({"Field": "Filed_Date", "Value": FilingDataResolver.parse_field(header_text, r"FILED AS OF DATE:\s*(\d{8})")})
-        # Company data
-        add({"Field": "Filer_Name", "Value": FilingDataResolver.parse_field(header_text, r"COMPANY CONFORMED NAME:\s*(.+)")})
-        add({"Field": "CIK", "Value": FilingDataResolver.parse_field(header_text, r"CENTRAL INDEX KEY:\s*(\d+)")})
-        # SIC may appear like: STANDARD INDUSTRIAL CLASSIFICATION: [desc] [6211]
-        sic_code = FilingDataResolver.parse_field(header_text, r"STANDARD INDUSTRIAL CLASSIFICATION:\s*.*\[(\d+)\]")
-        if not sic_code:
-            sic_code = FilingDataResolver.parse_field(header_text, r"SIC:\s*(\d+)")
-        add({"Field": "SIC", "Value": sic_code})
-        add({"Field": "IRS_Number", "Value": FilingDataResolver.parse_field(header_text, r"IRS NUMBER:\s*(\d+)")})
-        add({"Field": "State_of_Incorporation", "Value": FilingDataResolver.parse_field(header_text, r"STATE OF INCORPORATION:\s*([A-Z]{2})")})
-        add({"Field": "Fiscal_Year_End", "Value": FilingDataResolver.parse_field(header_text, r"FISCAL YEAR END:\s*(\d{4})")})
-        # Business address block
-        add({"Field": "Business_Address", "Value": FilingDataResolver.compose_business_address(header_text)})
-        add({"Field": "Business_Phone", "Value": FilingDataResolver.parse_field(header_text, r"BUSINESS PHONE:\s*([^\n]+)")})
-        # Filing values
-        add({"Field": "SEC_File_Number", "Value": FilingDataResolver.parse_field(header_text, r"SEC FILE NUMBER:\s*([0-9\-]+)")})
-        add({"Field": "Film_Number", "Value": FilingDataResolver.parse_field(header_text, r"FILM NUMBER:\s*(\d+)")})
-        # Former company
-        add({"Field": "Former_Name", "Value": FilingDataResolver.parse_field(header_text, r"FORMER CONFORMED NAME:\s*(.+)")})
-        add({"Field": "Former_Name_Change_Date", "Value": FilingDataResolver.parse_field(header_text, r"DATE OF NAME CHANGE:\s*(\d{8})")})
-        return rows
+        values: Dict[str, str] = {}
+        for m in _FILING_ALL.finditer(header_text):
+            # Keep the first occurrence of each field, as a plain search would
+            if m.lastgroup not in values:
+                values[m.lastgroup] = m.group(m.lastindex + 1).strip()
+        values["SIC"] = values.get("SIC") or values.get("SIC_Plain", "")
+        values["Business_Address"] = FilingDataResolver.compose_business_address(header_text)
+        return [{"Field": field, "Value": values.get(field, "")} for field in _FILING_OUTPUT]
 
 
 class TypeBlockScraper13FHR:
-    @staticmethod
-    def extract_block(text: str) -> Optional[str]:
-        m_start = re.search(r"<TYPE>\s*13F-HR\b", text, flags=re.IGNORECASE)
-        if not m_start:
-            return None
-        m_end = re.search(r"<TYPE>\s*INFORMATION TABLE\b", text[m_start.end():], flags=re.IGNORECASE)
-        end_pos = m_start.end() + (m_end.start() if m_end else 0)
-        block = text[m_start.end(): end_pos].strip()
-        return block if block else None
-
     @staticmethod
     def parse_to_rows(block: str) -> List[Dict[str, str]]:
         rows: List[Dict[str, str]] = []
-        for raw_line in block.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-            # Inline XML value like: <cik>0002012383</cik>
-            m_xml = re.match(r"^<([A-Za-z0-9]+)>(.*?)</\1>$", line)
-            if m_xml:
-                rows.append({"Field": m_xml.group(1), "Value": m_xml.group(2).strip()})
-                continue
-            # Ignore bare XML tags (opening/closing) without inline values
-            if re.match(r"^</?[A-Za-z0-9]+>", line):
-                continue
-            # Checkbox pattern like: "Check here if Amendment [X]"
-            m_cb = re.match(r"^(.*?)(\[\s*[Xx]\s*\]|\[\s*\])", line)
-            if m_cb:
-                field = m_cb.group(1).strip().rstrip(":")
-                value = "Yes" if "x" in m_cb.group(2).lower() else "No"
+        for m in _RE_TYPE_LINE.finditer(block):
+            kind = m.lastgroup
+            if kind == "xml":
+                # Inline XML value like: <cik>0002012383</cik>
+                rows.append({"Field": m.group("xml_tag"), "Value": m.group("xml_value").strip()})
+            elif kind == "checkbox":
+                # Checkbox pattern like: "Check here if Amendment [X]"
+                field = m.group("cb_field").strip().rstrip(":")
+                value = "Yes" if "x" in m.group("cb_box").lower() else "No"
                 rows.append({"Field": field or "_checkbox", "Value": value})
-                continue
-            if ":" in line:
-                field, value = line.split(":", 1)
-                rows.append({"Field": field.strip(), "Value": value.strip()})
-            else:
-                rows.append({"Field": "_text", "Value": line})
+            elif kind == "pair":
+                rows.append({"Field": m.group("pair_field").strip(), "Value": m.group("pair_value").strip()})
+            elif kind == "text":
+                rows.append({"Field": "_text", "Value": m.group("text").strip()})
+            # Bare XML tags (opening/closing) without inline values are ignored
         return rows
 
 
+class ExcelWriteError(Exception):
+    pass
+
+
 class WorkbookWriter:
-    def write(self, out_xlsx_path: str, df_infotable, filing_data_rows=None, type_block_rows=None):
+    def write(self, out_xlsx_path: str, df_infotable, filing_data_rows=None, type_block_rows=None, header_rows=None):
+        if not HAS_XLSX:
+            self.write_csv(out_xlsx_path, df_infotable, filing_data_rows, type_block_rows, header_rows)
+            return False
         try:
-            import pandas as pd
-            with pd.ExcelWriter(out_xlsx_path, engine="openpyxl") as writer:
+            with pd.ExcelWriter(out_xlsx_path, engine=EXCEL_ENGINE) as writer:
                 if df_infotable is not None:
                     df_infotable.to_excel(writer, index=False, sheet_name="InfoTable")
                 if filing_data_rows:
@@ -287,85 +442,318 @@ class WorkbookWriter:
                 if type_block_rows:
                     df_type = pd.DataFrame(type_block_rows, columns=["Field", "Value"])
                     df_type.to_excel(writer, index=False, sheet_name="13F-HR")
-            return True
-        except Exception:
-            import os
-            import csv
-            base, _ = os.path.splitext(out_xlsx_path)
-            out_info_csv = base + "_infotable.csv"
-            out_filing_csv = base + "_filing_data.csv"
-            out_type_csv = base + "_13fhr.csv"
-            if df_infotable is not None:
-                if hasattr(df_infotable, "to_csv"):
-                    df_infotable.to_csv(out_info_csv, index=False)
-                else:
-                    cols = list(df_infotable[0].keys()) if df_infotable else []
-                    with open(out_info_csv, "w", newline="") as f:
-                        w = csv.DictWriter(f, fieldnames=cols)
-                        w.writeheader()
-                        for r in df_infotable:
-                            w.writerow(r)
-            if filing_data_rows:
-                with open(out_filing_csv, "w", newline="") as f:
-                    w = csv.DictWriter(f, fieldnames=["Field", "Value"])
-                    w.writeheader()
-                    for r in filing_data_rows:
-                        w.writerow(r)
-            if type_block_rows:
-                with open(out_type_csv, "w", newline="") as f:
-                    w = csv.DictWriter(f, fieldnames=["Field", "Value"])
-                    w.writeheader()
-                    for r in type_block_rows:
-                        w.writerow(r)
+                if header_rows:
+                    df_header = SECHeaderParser.to_dataframe(header_rows)
+                    df_header.to_excel(writer, index=False, sheet_name="SEC-HEADER")
+        except Exception as e:
+            raise ExcelWriteError(f"Failed to write {out_xlsx_path}: {e}") from e
+        return True
+
+    def batch_write(self, out_xlsx_path: str, filings: List[Dict[str, object]]):
+        # filings: Extractor13FHR.extract results; one set of sheets per
+        # period, all written through a single ExcelWriter
+        # Filings sharing a period (e.g. amendments) get _2, _3, ... so no
+        # sheet set is written over another
+        suffixes: List[str] = []
+        for filing in filings:
+            date_str = str(filing["date_str"])
+            suffix, n = date_str, 1
+            while suffix in suffixes:
+                n += 1
+                suffix = f"{date_str}_{n}"
+            suffixes.append(suffix)
+        if not HAS_XLSX:
+            base, ext = os.path.splitext(out_xlsx_path)
+            for suffix, filing in zip(suffixes, filings):
+                self.write_csv(
+                    f"{base}_{suffix}{ext}",
+                    filing["df_infotable"],
+                    filing["filing_data_rows"],
+                    filing["type_block_rows"],
+                    filing["header_rows"],
+                )
             return False
+        try:
+            with pd.ExcelWriter(out_xlsx_path, engine=EXCEL_ENGINE) as writer:
+                for suffix, filing in zip(suffixes, filings):
+                    if filing["df_infotable"] is not None:
+                        filing["df_infotable"].to_excel(writer, index=False, sheet_name=f"InfoTable_{suffix}")
+                    if filing["filing_data_rows"]:
+                        df_filing = pd.DataFrame(filing["filing_data_rows"], columns=["Field", "Value"])
+                        df_filing.to_excel(writer, index=False, sheet_name=f"FilingData_{suffix}")
+                    if filing["type_block_rows"]:
+                        df_type = pd.DataFrame(filing["type_block_rows"], columns=["Field", "Value"])
+                        df_type.to_excel(writer, index=False, sheet_name=f"13F-HR_{suffix}")
+                    if filing["header_rows"]:
+                        df_header = SECHeaderParser.to_dataframe(filing["header_rows"])
+                        df_header.to_excel(writer, index=False, sheet_name=f"SEC-HEADER_{suffix}")
+        except Exception as e:
+            raise ExcelWriteError(f"Failed to write {out_xlsx_path}: {e}") from e
+        return True
+
+    @staticmethod
+    def write_csv(out_xlsx_path: str, df_infotable, filing_data_rows=None, type_block_rows=None, header_rows=None):
+        base, _ = os.path.splitext(out_xlsx_path)
+        out_info_csv = base + "_infotable.csv"
+        out_filing_csv = base + "_filing_data.csv"
+        out_type_csv = base + "_13fhr.csv"
+        out_header_csv = base + "_sec_header.csv"
+        if df_infotable is not None:
+            if hasattr(df_infotable, "to_csv"):
+                df_infotable.to_csv(out_info_csv, index=False)
+            else:
+                # Column lists from InfoTableExtractor.parse_rows (no pandas)
+                with open(out_info_csv, "w", newline="") as f:
+                    w = csv.writer(f)
+                    w.writerow(df_infotable.keys())
+                    w.writerows(zip(*df_infotable.values()))
+        if filing_data_rows:
+            with open(out_filing_csv, "w", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["Field", "Value"])
+                w.writeheader()
+                for r in filing_data_rows:
+                    w.writerow(r)
+        if type_block_rows:
+            with open(out_type_csv, "w", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["Field", "Value"])
+                w.writeheader()
+                for r in type_block_rows:
+                    w.writerow(r)
+        if header_rows:
+            with open(out_header_csv, "w", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["section_path", "field", "value"])
+                w.writeheader()
+                for r in header_rows:
+                    w.writerow(r)
 
 
 class Extractor13FHR:
-    def run(self, input_path: str, base_output_dir: str = None):
-        # Read text
-        with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+    def __init__(self, want_header_rows: bool = False):
+        # The line-by-line SEC-HEADER breakdown is only built on request;
+        # FilingData already surfaces the header fields most callers need
+        self.want_header_rows = want_header_rows
+
+    @staticmethod
+    def read_sections(input_path: str) -> Dict[str, Optional[Union[str, bytes]]]:
+        # Scan the file through mmap rather than reading and decoding it whole
+        with open(input_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return SubmissionSplitter.split(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return SubmissionSplitter.split(buf)
+
+    def extract(self, input_path: str) -> Dict[str, object]:
+        # Locate all sections in a single pass over the mapped submission
+        sections = self.read_sections(input_path)
+        header_block = sections["header"]
+        type_block = sections["type_block"]
+        xml = sections["info_xml"]
         # Resolve filing date
-        date_str = FilingDateResolver.parse_date(text)
+        date_str = FilingDateResolver.parse_date(header_block, type_block)
         # Extract FilingData from SEC-HEADER (sheet removed from output)
-        header_parser = SECHeaderParser(text)
-        header_block = header_parser.extract_block()
         filing_data_rows = FilingDataResolver.parse(header_block) if header_block else []
+        header_rows = SECHeaderParser.parse_rows(header_block) if self.want_header_rows and header_block else []
         # Extract InfoTable
-        info_extractor = InfoTableExtractor(text)
-        xml = info_extractor.extract_xml()
-        info_rows = info_extractor.parse_rows(xml) if xml else []
-        df_infotable = InfoTableExtractor.to_dataframe(info_rows)
+        info_extractor = InfoTableExtractor()
+        info_columns = info_extractor.parse_rows(xml) if xml else InfoTableExtractor.empty_columns()
+        df_infotable = InfoTableExtractor.to_dataframe(info_columns) if pd is not None else info_columns
         # Extract 13F-HR type block
-        type_block = TypeBlockScraper13FHR.extract_block(text)
         type_rows = TypeBlockScraper13FHR.parse_to_rows(type_block) if type_block else []
+        return {
+            "date_str": date_str,
+            "df_infotable": df_infotable,
+            "filing_data_rows": filing_data_rows,
+            "type_block_rows": type_rows,
+            "header_rows": header_rows,
+        }
+
+    def run(self, input_path: str, base_output_dir: str = None, out_name: Optional[str] = None):
+        # out_name (without .xlsx) defaults to the filing's period
+        filing = self.extract(input_path)
         # Derive output path
         issuer = PathUtils.derive_issuer_from_path(input_path)
         out_base = base_output_dir or os.path.join("data", "extracted_13F_HR")
         out_dir = os.path.join(out_base, issuer)
         PathUtils.ensure_dir(out_dir)
-        out_xlsx_path = os.path.join(out_dir, f"{date_str}.xlsx")
-        # Write workbook: InfoTable, FilingData, 13F-HR (no SEC-HEADER)
-        WorkbookWriter().write(out_xlsx_path, df_infotable=df_infotable, filing_data_rows=filing_data_rows, type_block_rows=type_rows)
+        out_xlsx_path = os.path.join(out_dir, f"{out_name or filing['date_str']}.xlsx")
+        # Write workbook: InfoTable, FilingData, 13F-HR (+ SEC-HEADER when requested)
+        WorkbookWriter().write(
+            out_xlsx_path,
+            df_infotable=filing["df_infotable"],
+            filing_data_rows=filing["filing_data_rows"],
+            type_block_rows=filing["type_block_rows"],
+            header_rows=filing["header_rows"],
+        )
         return out_xlsx_path
 
+    @staticmethod
+    def run_many(inputs: List[str], base_output_dir: str = None, want_header_rows: bool = False,
+                 max_workers: Optional[int] = None) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        # Consolidate every filing of an issuer into one workbook
+        # (<out-dir>/<issuer>.xlsx, sheets suffixed with the period) so the
+        # writer is opened once per issuer rather than once per filing.
+        # Filings are extracted across processes as in run_batch; one that
+        # fails is reported and left out of its issuer's workbook. Returns
+        # (input_path, out_xlsx_path, error) per input.
+        results: List[Tuple[str, Optional[str], Optional[str]]] = []
+        if not inputs:
+            return results
+        by_issuer: Dict[str, List[str]] = {}
+        for input_path in inputs:
+            by_issuer.setdefault(PathUtils.derive_issuer_from_path(input_path), []).append(input_path)
+        out_base = base_output_dir or os.path.join("data", "extracted_13F_HR")
+        PathUtils.ensure_dir(out_base)
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {path: executor.submit(_extract_worker, path, want_header_rows) for path in inputs}
+            for issuer, paths in sorted(by_issuer.items()):
+                filings, extracted = [], []
+                for path in sorted(paths):
+                    try:
+                        filing, err = futures[path].result()
+                    except Exception as e:
+                        # The worker process itself died (e.g. BrokenProcessPool)
+                        filing, err = None, f"{type(e).__name__}: {e}"
+                    if err:
+                        results.append((path, None, err))
+                    else:
+                        filings.append(filing)
+                        extracted.append(path)
+                if not filings:
+                    continue
+                out_xlsx_path = os.path.join(out_base, f"{issuer}.xlsx")
+                try:
+                    WorkbookWriter().batch_write(out_xlsx_path, filings)
+                    results.extend((path, out_xlsx_path, None) for path in extracted)
+                except Exception as e:
+                    results.extend((path, None, f"{type(e).__name__}: {e}") for path in extracted)
+        return results
+
+
+def _extract_worker(input_path: str, want_header_rows: bool) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    # Process-pool job for run_many: (filing, None) or (None, error)
+    try:
+        return Extractor13FHR(want_header_rows=want_header_rows).extract(input_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _run_worker(input_path: str, base_output_dir: Optional[str], out_name: str,
+                want_header_rows: bool) -> Tuple[Optional[str], Optional[str]]:
+    # Process-pool job: returns (out_xlsx_path, None) or (None, error) so no
+    # exception (lxml's XMLSyntaxError can't be pickled) crosses the pool
+    try:
+        return Extractor13FHR(want_header_rows=want_header_rows).run(input_path, base_output_dir, out_name), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(input_dir: str, base_output_dir: str = None, want_header_rows: bool = False,
+              max_workers: Optional[int] = None) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    # Each filing is an independent CPU-bound job, so fan them out across
+    # processes. Returns (input_path, out_xlsx_path, error) per .txt found.
+    inputs = sorted(str(p) for p in Path(input_dir).rglob("*.txt"))
+    results: List[Tuple[str, Optional[str], Optional[str]]] = []
+    if not inputs:
+        return results
+    # Workbooks are named after the input stem rather than the period, so
+    # same-period filings (e.g. amendments saved as <period>_2.txt) never
+    # share an output file between workers
+    out_names: List[str] = []
+    taken = set()
+    for path in inputs:
+        issuer, stem = PathUtils.derive_issuer_from_path(path), Path(path).stem
+        name, n = stem, 1
+        while (issuer, name) in taken:
+            n += 1
+            name = f"{stem}_{n}"
+        taken.add((issuer, name))
+        out_names.append(name)
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_run_worker, path, base_output_dir, name, want_header_rows)
+                   for path, name in zip(inputs, out_names)]
+        for path, future in zip(inputs, futures):
+            try:
+                out_path, err = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. BrokenProcessPool)
+                out_path, err = None, f"{type(e).__name__}: {e}"
+            results.append((path, out_path, err))
+    return results
+
 
 if __name__ == "__main__":
     import argparse
     import sys
 
     parser = argparse.ArgumentParser(description="Extract 13F-HR submission text to an Excel workbook")
-    parser.add_argument("input_path", help="Path to the 13F-HR submission .txt file")
+    parser.add_argument("input_path", nargs="?", help="Path to the 13F-HR submission .txt file")
+    parser.add_argument(
+        "--batch",
+        dest="batch_dir",
+        default=None,
+        help="Extract every .txt under this directory in parallel instead of a single file",
+    )
+    parser.add_argument(
+        "--combine",
+        action="store_true",
+        help="With --batch, write one workbook per issuer with a sheet set per period",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
     parser.add_argument(
         "--out-dir",
         dest="base_output_dir",
         default=None,
         help="Base output directory (default: data/extracted_13F_HR)",
     )
+    parser.add_argument(
+        "--header-rows",
+        dest="want_header_rows",
+        action="store_true",
+        help="Also write the parsed SEC-HEADER lines to a SEC-HEADER sheet",
+    )
     args = parser.parse_args()
+    if not args.input_path and not args.batch_dir:
+        parser.error("an input_path or --batch directory is required")
+    if args.input_path and args.batch_dir:
+        parser.error("pass either an input_path or --batch, not both")
+
+    if args.batch_dir:
+        started = time.perf_counter()
+        if args.combine:
+            results = Extractor13FHR.run_many(
+                sorted(str(p) for p in Path(args.batch_dir).rglob("*.txt")),
+                base_output_dir=args.base_output_dir,
+                want_header_rows=args.want_header_rows,
+                max_workers=args.workers,
+            )
+        else:
+            results = run_batch(
+                args.batch_dir,
+                base_output_dir=args.base_output_dir,
+                want_header_rows=args.want_header_rows,
+                max_workers=args.workers,
+            )
+        failed = 0
+        reported = set()
+        for path, out_path, err in results:
+            if err:
+                failed += 1
+                print(f"Error extracting {path}: {err}", file=sys.stderr)
+            elif out_path not in reported:
+                # With --combine several filings share one issuer workbook
+                reported.add(out_path)
+                print(f"Workbook written: {out_path}")
+        elapsed = time.perf_counter() - started
+        print(f"Processed {len(results)} filings ({failed} failed) in {elapsed:.1f}s")
+        sys.exit(2 if failed else 0)
 
     try:
-        extractor = Extractor13FHR()
+        extractor = Extractor13FHR(want_header_rows=args.want_header_rows)
         out_path = extractor.run(args.input_path, base_output_dir=args.base_output_dir)
         print(f"Workbook written: {out_path}")
         sys.exit(0)
@@ -19,49 +19,157 @@ or
 python3 src/data_extraction/scrape_edgar_links.py
 """
 
+import calendar
+import mmap
 import os
 import sys
 import re
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Callable, FrozenSet, NamedTuple, Optional, List, Dict, Set, Tuple
 
 USER_AGENT = (
     "institutional-holdings-insights/1.0 (contact: dev@example.com) "
     "requests"
 )
 DEFAULT_TIMEOUT = 20
+# .txt submissions are streamed to disk in chunks of this size
+STREAM_CHUNK_SIZE = 64 * 1024
+# The SGML header (and its CONFORMED PERIOD line) sits in the first few KiB
+HEAD_BYTES = 4096
+# Concurrent filing downloads. Concurrency alone does not bound the request
+# rate; EdgarFilingFetcher spaces requests MIN_REQUEST_INTERVAL apart
+MAX_WORKERS = 8
+# SEC fair-access guidance allows at most 10 requests/second per client
+MIN_REQUEST_INTERVAL = 0.1
 BASE_EDGAR = "https://www.sec.gov"
 
-try:
-    import pandas as pd  # type: ignore
-except Exception:
-    pd = None
 
-try:
-    import requests  # type: ignore
-except Exception:
-    requests = None
+# Optional third-party imports are deferred to first use (cached), so a run
+# that finds no workbooks never pays for pandas/requests/bs4/lxml.
+@lru_cache(maxsize=None)
+def _pandas():
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        return None
+    return pd
+
+
+@lru_cache(maxsize=None)
+def _requests():
+    try:
+        import requests  # type: ignore
+        from requests.adapters import HTTPAdapter  # type: ignore
+        from urllib3.util.retry import Retry  # type: ignore
+    except Exception:
+        return None
+    return requests, HTTPAdapter, Retry
+
 
-try:
-    from bs4 import BeautifulSoup  # type: ignore
-except Exception:
-    BeautifulSoup = None
+@lru_cache(maxsize=None)
+def _beautiful_soup():
+    try:
+        from bs4 import BeautifulSoup  # type: ignore
+    except Exception:
+        return None
+    return BeautifulSoup
+
+
+class _Lxml(NamedTuple):
+    html: Any
+    period_xpath: Callable[[Any], List[str]]
+    txt_href_xpath: Callable[[Any], List[str]]
+
+
+@lru_cache(maxsize=None)
+def _lxml() -> Optional[_Lxml]:
+    # lxml.html plus the page XPaths, compiled once
+    try:
+        from lxml import etree as LET  # type: ignore
+        from lxml import html as lxml_html  # type: ignore
+    except Exception:
+        return None
+    return _Lxml(lxml_html, LET.XPath(_XPATH_PERIOD), LET.XPath(_XPATH_COMPLETE_TXT_HREF))
+
+
+# Patterns used per filing page / candidate string, compiled once
+_RE_DATE_YMD = re.compile(r"(\d{4})[-/]?(\d{2})[-/]?(\d{2})")
+_RE_DATE_DMY = re.compile(r"(\d{2})[-/ ]([A-Za-z]{3})[-/ ](\d{4})")
+_RE_PERIOD_LABEL_LOOSE = re.compile(r"Period\s*of\s*Report", re.I)
+_RE_PERIOD_AFTER_LABEL = re.compile(r"Period\s*of\s*Report\s*[:\-]?\s*(.*?)<", re.I | re.S)
+_RE_PERIOD_FALLBACK = re.compile(r"(\d{4}[\-/]?\d{2}[\-/]?\d{2})")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_COMPLETE_TXT = re.compile(r"Complete\s+submission\s+text\s+file", re.I)
+_RE_TXT_HREF = re.compile(r"href=\"([^\"]+\.txt)\"", re.I)
+_RE_CONFORMED_PERIOD = re.compile(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", re.I)
+_RE_PERIOD_OF_REPORT = re.compile(r"<periodOfReport>([^<]+)</periodOfReport>", re.I)
+_RE_CONFORMED_PERIOD_BYTES = re.compile(rb"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", re.I)
+_RE_PERIOD_OF_REPORT_BYTES = re.compile(rb"<periodOfReport>([^<]+)</periodOfReport>", re.I)
+_RE_NON_DIGIT = re.compile(r"[^0-9]")
+_MONTHS = {name: i for i, name in enumerate(
+    ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), 1)}
+
+# EDGAR filing index pages lay out fields as <div class="infoHead">label</div>
+# followed by <div class="info">value</div>, and list documents in a table
+# whose "Complete submission text file" row links the .txt
+_LOWER = "translate(%s, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_XPATH_PERIOD = (
+    "//div[contains(@class,'infoHead')][contains(normalize-space(.),'Period of Report')]"
+    "/following-sibling::div[contains(@class,'info')][1]//text()"
+)
+_XPATH_COMPLETE_TXT_HREF = (
+    "//a[contains(%s,'complete submission text file')]/@href"
+    " | //tr[td[contains(%s,'complete submission text file')]]//a/@href"
+    % (_LOWER % "normalize-space(.)", _LOWER % "normalize-space(.)")
+)
 
 
 def _safe_mkdir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _read_excel(file_path: Path) -> List["pd.DataFrame"]:
+def _read_excel(file_path: Path, column_candidates: Optional[List[List[str]]] = None,
+                optional_candidates: Optional[List[List[str]]] = None) -> List["pd.DataFrame"]:
+    pd = _pandas()
     if pd is None:
         raise RuntimeError("pandas is required to read Excel files")
     # Read all sheets to be flexible with varying Excel formats
     xls = pd.ExcelFile(file_path)
-    dfs = [xls.parse(sheet_name) for sheet_name in xls.sheet_names]
+    if not column_candidates:
+        return [xls.parse(sheet_name) for sheet_name in xls.sheet_names]
+    # Sniff each sheet's header and load only the first matching column per
+    # candidate list; sheets missing any required one are skipped, optional
+    # ones are loaded when present
+    dfs = []
+    for sheet_name in xls.sheet_names:
+        header = xls.parse(sheet_name, nrows=0)
+        cols = [_find_column(header, names) for names in column_candidates]
+        if all(cols):
+            extra = [_find_column(header, names) for names in optional_candidates or []]
+            dfs.append(xls.parse(sheet_name, usecols=cols + [c for c in extra if c and c not in cols]))
     return dfs
 
 
+def _claim_path(directory: Path, stem: str, suffix: str) -> Path:
+    # Create <stem><suffix> exclusively, else <stem>_2<suffix>, <stem>_3<suffix>, ...
+    # so a save never lands on a file that already exists
+    n = 1
+    while True:
+        path = directory / (f"{stem}{suffix}" if n == 1 else f"{stem}_{n}{suffix}")
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            n += 1
+            continue
+        os.close(fd)
+        return path
+
+
 def _find_column(df: "pd.DataFrame", names: List[str]) -> Optional[str]:
     lower_cols = {c.lower(): c for c in df.columns}
     for name in names:
@@ -71,51 +179,102 @@ def _find_column(df: "pd.DataFrame", names: List[str]) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=4096)
 def _normalize_period(period_str: str) -> Optional[str]:
+    # Cached: the same candidate strings recur across filing pages
     if not period_str:
         return None
     s = period_str.strip()
+    # EDGAR index pages render the period as exactly YYYY-MM-DD: slice it
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and (s[:4] + s[5:7] + s[8:]).isdigit():
+        return s[:4] + s[5:7] + s[8:]
     # Accept formats like YYYY-MM-DD or MM-DD-YYYY or YYYYMMDD
-    m = re.search(r"(\d{4})[-/]?(\d{2})[-/]?(\d{2})", s)
+    m = _RE_DATE_YMD.search(s)
     if m:
-        return f"{m.group(1)}{m.group(2)}{m.group(3)}"
+        return "".join(m.groups())
     # Try DD-Mon-YYYY or Mon-DD-YYYY
-    m2 = re.search(r"(\d{2})[-/ ]([A-Za-z]{3})[-/ ](\d{4})", s)
+    m2 = _RE_DATE_DMY.search(s)
     if m2:
-        try:
-            import datetime
-            dt = datetime.datetime.strptime("-".join(m2.groups()), "%d-%b-%Y")
-            return dt.strftime("%Y%m%d")
-        except Exception:
-            pass
+        day, mon, year = m2.groups()
+        month = _MONTHS.get(mon.upper())
+        # Same validation strptime("%d-%b-%Y") applied, without building a datetime
+        if month and int(year) >= 1 and 1 <= int(day) <= calendar.monthrange(int(year), month)[1]:
+            return f"{year}{month:02d}{day}"
     return None
 
 
 class FilingPageParser:
+    @staticmethod
+    def parse(html: str, base_url: str) -> Tuple[Optional[str], Optional[str]]:
+        # (period, txt_url) from one lxml tree; a BeautifulSoup tree is built
+        # only if an XPath lookup misses, and then shared by both fallbacks
+        tree = FilingPageParser._parse_tree(html)
+        period = FilingPageParser._period_from_tree(tree)
+        txt_url = FilingPageParser._txt_link_from_tree(tree, base_url)
+        if period is None or txt_url is None:
+            soup = FilingPageParser._make_soup(html)
+            if period is None:
+                period = FilingPageParser._period_fallback(html, soup)
+            if txt_url is None:
+                txt_url = FilingPageParser._txt_link_fallback(html, base_url, soup)
+        return period, txt_url
+
     @staticmethod
     def extract_period_from_html(html: str) -> Optional[str]:
-        # Use BeautifulSoup if available, else regex fallback
-        if BeautifulSoup:
-            soup = BeautifulSoup(html, "html.parser")
-            # Look for label text "Period of Report"
-            label = soup.find(string=re.compile(r"Period\s+of\s+Report", re.I))
-            if label:
-                # Common EDGAR detail page structure: the value is near the label
-                # Try next elements around the label
-                parent = label.parent
-                # Collect candidates from siblings
-                candidates: List[str] = []
-                if parent:
-                    for sib in parent.find_all_next(string=True, limit=5):
-                        val = str(sib).strip()
-                        if val and not re.search(r"Period\s+of\s+Report", val, re.I):
-                            candidates.append(val)
-                for cand in candidates:
-                    norm = _normalize_period(cand)
-                    if norm:
-                        return norm
-            # Additional selectors
-            for node in soup.find_all(string=re.compile(r"Period\s*of\s*Report", re.I)):
+        tree = FilingPageParser._parse_tree(html)
+        return (FilingPageParser._period_from_tree(tree)
+                or FilingPageParser._period_fallback(html, FilingPageParser._make_soup(html)))
+
+    @staticmethod
+    def extract_txt_link(html: str, base_url: str) -> Optional[str]:
+        tree = FilingPageParser._parse_tree(html)
+        return (FilingPageParser._txt_link_from_tree(tree, base_url)
+                or FilingPageParser._txt_link_fallback(html, base_url, FilingPageParser._make_soup(html)))
+
+    @staticmethod
+    def _parse_tree(html: str):
+        lxml = _lxml()
+        if lxml is None or not html:
+            return None
+        try:
+            return lxml.html.fromstring(html)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _make_soup(html: str):
+        BeautifulSoup = _beautiful_soup()
+        if BeautifulSoup is None:
+            return None
+        # Parse with lxml when available (faster than html.parser)
+        return BeautifulSoup(html, "lxml" if _lxml() is not None else "html.parser")
+
+    @staticmethod
+    def _absolute_url(href: str, base_url: str) -> str:
+        return href if href.startswith("http") else base_url.rstrip("/") + href
+
+    @staticmethod
+    def _period_from_tree(tree) -> Optional[str]:
+        # Targeted XPath on the standard page layout
+        if tree is None:
+            return None
+        return _normalize_period(" ".join(_lxml().period_xpath(tree)))
+
+    @staticmethod
+    def _txt_link_from_tree(tree, base_url: str) -> Optional[str]:
+        if tree is None:
+            return None
+        for href in _lxml().txt_href_xpath(tree):
+            if href.lower().endswith(".txt"):
+                return FilingPageParser._absolute_url(href, base_url)
+        return None
+
+    @staticmethod
+    def _period_fallback(html: str, soup) -> Optional[str]:
+        # Pages off the standard infoHead/info layout: use BeautifulSoup if
+        # available, else regex fallback
+        if soup is not None:
+            for node in soup.find_all(string=_RE_PERIOD_LABEL_LOOSE):
                 # examine following text nodes quickly
                 texts = []
                 nxt = node.parent
@@ -128,14 +287,14 @@ class FilingPageParser:
                     if norm:
                         return norm
         # Regex fallback: find text after label
-        m = re.search(r"Period\s*of\s*Report\s*[:\-]?\s*(.*?)<", html, flags=re.I | re.S)
+        m = _RE_PERIOD_AFTER_LABEL.search(html)
         if m:
-            val = re.sub(r"\s+", " ", m.group(1)).strip()
+            val = _RE_WHITESPACE.sub(" ", m.group(1)).strip()
             norm = _normalize_period(val)
             if norm:
                 return norm
         # Another fallback: find yyyymmdd in HTML
-        m2 = re.search(r"(\d{4}[\-/]?\d{2}[\-/]?\d{2})", html)
+        m2 = _RE_PERIOD_FALLBACK.search(html)
         if m2:
             norm = _normalize_period(m2.group(1))
             if norm:
@@ -143,24 +302,21 @@ class FilingPageParser:
         return None
 
     @staticmethod
-    def extract_txt_link(html: str, base_url: str) -> Optional[str]:
-        if BeautifulSoup:
-            soup = BeautifulSoup(html, "html.parser")
+    def _txt_link_fallback(html: str, base_url: str, soup) -> Optional[str]:
+        if soup is not None:
             # Prefer anchors with 'Complete submission text file'
-            a = soup.find("a", string=re.compile(r"Complete\s+submission\s+text\s+file", re.I))
+            a = soup.find("a", string=_RE_COMPLETE_TXT)
             if a and a.get("href"):
-                href = a.get("href")
-                return href if href.startswith("http") else base_url.rstrip("/") + href
+                return FilingPageParser._absolute_url(a.get("href"), base_url)
             # Else, first .txt link
             for a in soup.find_all("a", href=True):
                 href = a.get("href")
                 if href and href.lower().endswith(".txt"):
-                    return href if href.startswith("http") else base_url.rstrip("/") + href
+                    return FilingPageParser._absolute_url(href, base_url)
         # Regex fallback
-        m = re.search(r"href=\"([^\"]+\.txt)\"", html, flags=re.I)
+        m = _RE_TXT_HREF.search(html)
         if m:
-            href = m.group(1)
-            return href if href.startswith("http") else base_url.rstrip("/") + href
+            return FilingPageParser._absolute_url(m.group(1), base_url)
         return None
 
 
@@ -168,54 +324,194 @@ class FilingTextParser:
     @staticmethod
     def extract_period_from_text(text: str) -> Optional[str]:
         # Look for header labels used previously
-        m = re.search(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", text, flags=re.I)
+        m = _RE_CONFORMED_PERIOD.search(text)
         if m:
             return m.group(1)
-        m2 = re.search(r"<periodOfReport>([^<]+)</periodOfReport>", text, flags=re.I)
+        m2 = _RE_PERIOD_OF_REPORT.search(text)
         if m2:
             return _normalize_period(m2.group(1))
         return None
 
+    @staticmethod
+    def extract_period_from_bytes(data: bytes) -> Optional[str]:
+        # Same lookups as extract_period_from_text, on undecoded bytes
+        m = _RE_CONFORMED_PERIOD_BYTES.search(data)
+        if m:
+            return m.group(1).decode("ascii")
+        m2 = _RE_PERIOD_OF_REPORT_BYTES.search(data)
+        if m2:
+            return _normalize_period(m2.group(1).decode("utf-8", "replace"))
+        return None
 
-class EdgarFilingFetcher:
     @staticmethod
-    def get(url: str) -> Tuple[Optional[str], Optional[str]]:
-        if requests is None:
+    def extract_period_from_file(path: Path) -> Optional[str]:
+        # Scan the memory-mapped file: the SGML header window first, then the
+        # whole file only if it misses (e.g. periodOfReport in the XML body)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                m = _RE_CONFORMED_PERIOD_BYTES.search(mm, 0, HEAD_BYTES)
+                if m:
+                    return m.group(1).decode("ascii")
+                return FilingTextParser.extract_period_from_bytes(mm)
+
+
+class EdgarFilingFetcher:
+    # Next free request slot, shared by every fetcher and worker thread
+    _throttle_lock = threading.Lock()
+    _next_request_at = 0.0
+
+    def __init__(self):
+        # One pooled keep-alive session for every page and .txt download,
+        # created on first request (worker threads share it)
+        self._session = None
+        self._session_ready = False
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if not self._session_ready:
+                self._session_ready = True
+                lib = _requests()
+                if lib is not None:
+                    requests, HTTPAdapter, Retry = lib
+                    self._session = requests.Session()
+                    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS, max_retries=retry)
+                    self._session.mount("https://", adapter)
+                    self._session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+            return self._session
+
+    @classmethod
+    def _throttle(cls) -> None:
+        # Reserve the next slot under the lock, then sleep until it outside it
+        with cls._throttle_lock:
+            now = time.monotonic()
+            slot = max(now, cls._next_request_at)
+            cls._next_request_at = slot + MIN_REQUEST_INTERVAL
+        if slot > now:
+            time.sleep(slot - now)
+
+    def get(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        session = self.session
+        if session is None:
             return None, "requests library not available"
+        self._throttle()
         try:
-            resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=DEFAULT_TIMEOUT)
+            resp = session.get(url, timeout=DEFAULT_TIMEOUT)
             if resp.status_code != 200:
                 return None, f"HTTP {resp.status_code} for {url}"
             return resp.text, None
         except Exception as e:
             return None, str(e)
 
+    def stream_to(self, url: str, out_path: Path) -> Optional[str]:
+        # Write the response body to out_path as it arrives; returns an error or None
+        session = self.session
+        if session is None:
+            return "requests library not available"
+        self._throttle()
+        try:
+            with session.get(url, timeout=DEFAULT_TIMEOUT, stream=True) as resp:
+                if resp.status_code != 200:
+                    return f"HTTP {resp.status_code} for {url}"
+                with open(out_path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+            return None
+        except Exception as e:
+            return str(e)
+
 
 class EdgarLinksProcessor:
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
         self.links_dir = base_dir / "data" / "edgar_links"
         self.raw_out_base = base_dir / "data" / "raw_13F_HR"
+        self.fetcher = EdgarFilingFetcher()
+        # Filing URLs already handled this run, keyed with their destination
+        self._seen_urls: Set[Tuple[Optional[Path], str]] = set()
+        self._seen_lock = threading.Lock()
 
     def list_excel_files(self) -> List[Path]:
         if not self.links_dir.exists():
             return []
         return [p for p in self.links_dir.iterdir() if p.is_file() and p.suffix.lower() == ".xlsx"]
 
-    def process_file(self, xlsx_path: Path) -> Dict[str, str]:
-        result: Dict[str, str] = {"file": str(xlsx_path), "status": "skipped"}
+    def _claim_url(self, issuer_dir: Optional[Path], url: str) -> bool:
+        # False if this filing URL was already taken for the same destination this run
+        key = (issuer_dir, url)
+        with self._seen_lock:
+            if key in self._seen_urls:
+                return False
+            self._seen_urls.add(key)
+            return True
+
+    def fetch_filing(self, filing_url: str, period_hint: Optional[str] = None, dest_dir: Optional[Path] = None,
+                     existing: FrozenSet[str] = frozenset()) -> Tuple[Optional[str], Optional[Path], Optional[str]]:
+        # Page fetch -> parse -> .txt download for one row; returns (period, part_path, error).
+        # The .txt is streamed to a .part file in dest_dir (system temp if None)
+        # which the caller renames into place or deletes. part_path is None when
+        # <period>.txt was already in `existing` and the download was skipped.
+        if period_hint and f"{period_hint}.txt" in existing:
+            return period_hint, None, None
+        html, err = self.fetcher.get(filing_url)
+        if err or not html:
+            return None, None, f"Filing page fetch failed: {err}"
+        period, txt_url = FilingPageParser.parse(html, BASE_EDGAR)
+        if not txt_url:
+            return None, None, "No .txt link found on filing page"
+        if period and f"{_RE_NON_DIGIT.sub('', period)}.txt" in existing:
+            return period, None, None
+        fd, part_name = tempfile.mkstemp(suffix=".part", dir=dest_dir)
+        os.close(fd)
+        part_path = Path(part_name)
+        err2 = self.fetcher.stream_to(txt_url, part_path)
+        if err2 or part_path.stat().st_size == 0:
+            part_path.unlink()
+            return None, None, f"Text file fetch failed: {err2}"
+        if not period:
+            period = FilingTextParser.extract_period_from_file(part_path)
+        if not period:
+            part_path.unlink()
+            return None, None, "Missing Period of Report"
+        return period, part_path, None
+
+    def process_file(self, xlsx_path: Path) -> Dict[str, Any]:
+        # Per-row outcomes are collected in lists: errors as (row, message),
+        # saved/exists as output paths
+        result: Dict[str, Any] = {"file": str(xlsx_path), "status": "skipped",
+                                  "errors": [], "saved": [], "exists": []}
+        errors: List[Tuple[int, str]] = result["errors"]
+        saved: List[str] = result["saved"]
+        exists: List[str] = result["exists"]
         if xlsx_path.suffix.lower() != ".xlsx":
             result["error"] = "Not an .xlsx file"
             return result
+        # Find column names flexibly
+        filing_url_col_candidates = ["filings url", "filing url", "url", "link", "href"]
+        form_type_candidates = ["form type", "form", "type"]
+        period_candidates = ["period of report", "periodofreport", "period"]
         try:
-            dfs = _read_excel(xlsx_path)
+            dfs = _read_excel(xlsx_path, [form_type_candidates, filing_url_col_candidates], [period_candidates])
         except Exception as e:
             result["error"] = f"Failed to read Excel: {e}"
             return result
-        # Find column names flexibly
-        filing_url_col_candidates = ["filings url", "filing url", "url", "link", "href"]
-        form_type_candidates = ["form type", "form", "type"]
-        processed = 0
+        # Conditionally save if this Excel belongs to a known issuer (e.g., BlackRock or Vanguard)
+        name_lower = xlsx_path.name.lower()
+        issuer_dir: Optional[Path] = None
+        if ("blackrock" in name_lower) or ("vanguard" in name_lower):
+            issuer = "blackrock" if "blackrock" in name_lower else "vanguard"
+            issuer_dir = self.raw_out_base / issuer
+            _safe_mkdir(issuer_dir)
+        # Files present before this run; rows whose period is already on disk
+        # skip the network entirely. Files saved during the run don't count,
+        # so same-period rows (e.g. amendments) behave as before.
+        existing = frozenset(p.name for p in issuer_dir.glob("*.txt")) if issuer_dir is not None else frozenset()
+        filing_urls: List[str] = []
+        period_hints: List[Optional[str]] = []
         for df in dfs:
             if df is None or df.empty:
                 continue
@@ -223,62 +519,67 @@ class EdgarLinksProcessor:
             # Try to find required columns
             form_col = _find_column(df, form_type_candidates)
             url_col = _find_column(df, filing_url_col_candidates)
+            period_col = _find_column(df, period_candidates)
             if not form_col or not url_col:
                 continue
-            for _, row in df.iterrows():
-                form_val = str(row.get(form_col, "")).strip().upper()
-                if "13F-HR" not in form_val:
-                    continue
-                filing_url = str(row.get(url_col, "")).strip()
-                if not filing_url:
-                    continue
-                # fetch filing detail page
-                html, err = EdgarFilingFetcher.get(filing_url)
-                if err or not html:
-                    result[f"error_{processed}"] = f"Filing page fetch failed: {err}"
+            # Select 13F-HR rows with a URL column-wise instead of per row
+            urls = df[url_col].astype(str).str.strip()
+            mask = (df[form_col].astype(str).str.upper().str.contains("13F-HR", regex=False)
+                    & df[url_col].notna() & (urls != ""))
+            hints = df.loc[mask, period_col].astype(str) if period_col else [""] * int(mask.sum())
+            for filing_url, hint in zip(urls[mask], hints):
+                if not self._claim_url(issuer_dir, filing_url):
                     continue
-                period = FilingPageParser.extract_period_from_html(html)
-                txt_url = FilingPageParser.extract_txt_link(html, BASE_EDGAR)
-                if not txt_url:
-                    result[f"error_{processed}"] = "No .txt link found on filing page"
+                filing_urls.append(filing_url)
+                period_hints.append(_normalize_period(hint))
+        # Downloads overlap on the shared session; saving stays in row order
+        # on this thread, and each destination is claimed exclusively
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            fetch = partial(self.fetch_filing, dest_dir=issuer_dir, existing=existing)
+            fetched = pool.map(fetch, filing_urls, period_hints)
+            processed = 0
+            for row, (period, part_path, err) in enumerate(fetched):
+                if err:
+                    errors.append((row, err))
                     continue
-                text, err2 = EdgarFilingFetcher.get(txt_url)
-                if err2 or not text:
-                    result[f"error_{processed}"] = f"Text file fetch failed: {err2}"
-                    continue
-                if not period:
-                    period = FilingTextParser.extract_period_from_text(text)
-                if not period:
-                    result[f"error_{processed}"] = "Missing Period of Report"
-                    continue
-                # Conditionally save if this Excel belongs to a known issuer (e.g., BlackRock or Vanguard)
-                name_lower = xlsx_path.name.lower()
-                if ("blackrock" in name_lower) or ("vanguard" in name_lower):
-                    issuer = "blackrock" if "blackrock" in name_lower else "vanguard"
-                    issuer_dir = self.raw_out_base / issuer
-                    _safe_mkdir(issuer_dir)
-                    safe_period = re.sub(r"[^0-9]", "", period)
+                if part_path is None:
+                    exists.append(str(issuer_dir / f"{_RE_NON_DIGIT.sub('', period)}.txt"))
+                elif issuer_dir is not None:
+                    safe_period = _RE_NON_DIGIT.sub("", period)
                     if len(safe_period) != 8:
-                        result[f"error_{processed}"] = f"Unsafe period value: {period}"
+                        part_path.unlink()
+                        errors.append((row, f"Unsafe period value: {period}"))
                         continue
-                    out_path = issuer_dir / f"{safe_period}.txt"
+                    out_path: Optional[Path] = None
                     try:
-                        # Avoid overwriting silently; if exists, append a timestamp suffix
-                        if out_path.exists():
-                            ts = int(time.time())
-                            out_path = issuer_dir / f"{safe_period}_{ts}.txt"
-                        out_path.write_text(text, encoding="utf-8")
-                        result[f"saved_{processed}"] = str(out_path)
+                        # Avoid overwriting silently; if taken, append _2, _3, ...
+                        out_path = _claim_path(issuer_dir, safe_period, ".txt")
+                        os.replace(part_path, out_path)
+                        saved.append(str(out_path))
                         result["status"] = "saved"
                     except Exception as e:
-                        result[f"error_{processed}"] = f"Failed to save: {e}"
+                        # Drop the empty claimed file too, or the next run would
+                        # take it for an already-downloaded period
+                        if out_path is not None and part_path.exists():
+                            out_path.unlink(missing_ok=True)
+                        part_path.unlink(missing_ok=True)
+                        errors.append((row, f"Failed to save: {e}"))
                         continue
+                else:
+                    part_path.unlink()
                 processed += 1
         if processed == 0 and result.get("status") != "saved":
             result["status"] = "no_matches"
         return result
 
 
+def format_result(name: str, res: Dict[str, Any]) -> str:
+    # Summary of one process_file result, shared with scripts/scrape_edgar_links.sh
+    details = ([f"saved:{p}" for p in res["saved"]] + [f"exists:{p}" for p in res["exists"]]
+               + [f"error_{row}:{e}" for row, e in res["errors"]])
+    return f"Processed: {name} -> {res.get('status')}\n  Details: {', '.join(details)}"
+
+
 def main() -> int:
     base = Path(__file__).resolve().parents[2]  # project root
     processor = EdgarLinksProcessor(base)
@@ -286,12 +587,13 @@ def main() -> int:
     if not files:
         print("No .xlsx files found in data/edgar_links")
         return 0
-    overall: List[Dict[str, str]] = []
+    overall: List[Dict[str, Any]] = []
+    # Workbooks run one at a time so only one MAX_WORKERS download pool is
+    # ever active against EDGAR and the shared session
     for xlsx in files:
         res = processor.process_file(xlsx)
         overall.append(res)
-        print(f"Processed: {xlsx.name} -> {res.get('status')}\n  Details: "
-              f"{', '.join([f'{k}:{v}' for k,v in res.items() if k.startswith('error_') or k.startswith('saved_')])}")
+        print(format_result(xlsx.name, res))
     return 0
 
 
@@ -1,13 +1,7 @@
-import importlib
-
-_mod = importlib.import_module('.13F_HR_class_title_transformer', __package__)
-
-classify_class_title_category = getattr(_mod, 'classify_class_title_category')
-classify_class_title_categories = getattr(_mod, 'classify_class_title_categories')
-apply_class_category_column = getattr(_mod, 'apply_class_category_column')
+from .class_title_extract import ClassTitleExtractor
+from .class_title_transform import ClassTitleTransform
 
 __all__ = [
-    'classify_class_title_category',
-    'classify_class_title_categories',
-    'apply_class_category_column',
+    'ClassTitleExtractor',
+    'ClassTitleTransform',
 ]
\ No newline at end of file
@@ -6,8 +6,14 @@ extracts the 'class_title' column from each, and saves unique values to a CSV fi
 """
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Set, Tuple
+
+from openpyxl import load_workbook
+
+# Upper bound on Excel files read concurrently
+MAX_WORKERS = 8
 
 
 class ClassTitleExtractor:
@@ -21,7 +27,8 @@ class ClassTitleExtractor:
         self.extracted_data_dir = self.base_dir / "data" / "extracted_13F_HR"
         self.output_dir = self.base_dir / "data" / "metadata"
         self.output_file = self.output_dir / "unique_class_title.csv"
-        self.all_class_titles = []
+        self.all_titles_set: Set[str] = set()
+        self.total_class_titles = 0
     
     def _get_xlsx_files(self, folder: Path) -> List[Path]:
         """
@@ -37,37 +44,52 @@ class ClassTitleExtractor:
         # Filter out temporary files (starting with ~$)
         return [f for f in xlsx_files if not f.name.startswith("~$")]
     
-    def _extract_from_file(self, xlsx_file: Path) -> int:
+    def _extract_from_file(self, xlsx_file: Path) -> Tuple[int, Set[str]]:
         """
         Extract class_title values from a single Excel file.
         
+        Runs on a worker thread, so it returns the values instead of
+        touching self.all_titles_set.
+        
         Args:
             xlsx_file: Path to the Excel file
             
         Returns:
-            Number of class_title values extracted
+            Number of class_title values extracted and the set of distinct
+            values (0 and an empty set on error)
         """
         try:
             print(f"    Reading: {xlsx_file.name}")
             
-            # Read the Excel file
-            df = pd.read_excel(xlsx_file)
-            
-            # Check if 'class_title' column exists
-            if 'class_title' in df.columns:
-                # Extract class_title values (drop NaN values)
-                class_titles = df['class_title'].dropna().tolist()
-                self.all_class_titles.extend(class_titles)
-                print(f"      Extracted {len(class_titles)} class_title values")
-                return len(class_titles)
-            else:
-                print(f"      Warning: 'class_title' column not found in {xlsx_file.name}")
-                print(f"      Available columns: {', '.join(df.columns)}")
-                return 0
+            # Stream the first sheet read-only and keep just the class_title column
+            wb = load_workbook(xlsx_file, read_only=True, data_only=True)
+            try:
+                rows = wb.worksheets[0].iter_rows(values_only=True)
+                header = list(next(rows, ()))
+                
+                # Check if 'class_title' column exists
+                if 'class_title' in header:
+                    idx = header.index('class_title')
+                    # Extract class_title values (skip empty cells), collapsing
+                    # intra-file duplicates before the cross-file merge
+                    count = 0
+                    class_titles: Set[str] = set()
+                    for row in rows:
+                        if len(row) > idx and row[idx] is not None:
+                            count += 1
+                            class_titles.add(str(row[idx]))
+                    print(f"      Extracted {count} class_title values from {xlsx_file.name}")
+                    return count, class_titles
+                else:
+                    print(f"      Warning: 'class_title' column not found in {xlsx_file.name}")
+                    print(f"      Available columns: {', '.join(str(c) for c in header)}")
+                    return 0, set()
+            finally:
+                wb.close()
                 
         except Exception as e:
             print(f"      Error reading {xlsx_file.name}: {str(e)}")
-            return 0
+            return 0, set()
     
     def extract(self) -> pd.DataFrame:
         """
@@ -79,12 +101,14 @@ class ClassTitleExtractor:
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Reset class_titles list
-        self.all_class_titles = []
+        # Reset class_title set and count
+        self.all_titles_set = set()
+        self.total_class_titles = 0
         
         print(f"Scanning directory: {self.extracted_data_dir}")
         
-        # Iterate through all subdirectories in extracted_13F_HR
+        # Collect .xlsx files from all subdirectories in extracted_13F_HR
+        all_xlsx_files = []
         for folder in self.extracted_data_dir.iterdir():
             if folder.is_dir():
                 print(f"\nProcessing folder: {folder.name}")
@@ -92,16 +116,21 @@ class ClassTitleExtractor:
                 # Find all .xlsx files in the folder
                 xlsx_files = self._get_xlsx_files(folder)
                 print(f"  Found {len(xlsx_files)} Excel files")
-                
-                # Process each Excel file
-                for xlsx_file in xlsx_files:
-                    self._extract_from_file(xlsx_file)
+                all_xlsx_files.extend(xlsx_files)
+        
+        # Read the files concurrently and merge the returned values here
+        if all_xlsx_files:
+            workers = min(MAX_WORKERS, len(all_xlsx_files))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                for count, titles in ex.map(self._extract_from_file, all_xlsx_files):
+                    self.total_class_titles += count
+                    self.all_titles_set.update(titles)
         
         # Get unique class_title values
-        unique_class_titles = sorted(set(self.all_class_titles))
+        unique_class_titles = sorted(self.all_titles_set)
         
         print(f"\n{'='*60}")
-        print(f"Total class_title values found: {len(self.all_class_titles)}")
+        print(f"Total class_title values found: {self.total_class_titles}")
         print(f"Unique class_title values: {len(unique_class_titles)}")
         print(f"{'='*60}")
         
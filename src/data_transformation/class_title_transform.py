@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 import re
+from functools import lru_cache
 
 class ClassTitleTransform:
     def __init__(self):
@@ -9,28 +11,50 @@ class ClassTitleTransform:
         """Normalize title for better matching"""
         return ' '.join(str(title).upper().split())
     
-    def transform(self, series):
+    def transform(self, series, as_categorical=False):
         """
         Transform a pandas Series of class titles into standardized categories
         
+        Each distinct title is categorized once and the result is broadcast
+        back to every row through its factorized code.
+        
         Parameters:
         -----------
         series : pd.Series
             Series containing security class titles
+        as_categorical : bool, default False
+            Return a categorical Series (one small code per row) instead of
+            an object Series of repeated label strings
             
         Returns:
         --------
         pd.Series
             Series with standardized category names
         """
-        return series.apply(self._categorize_single)
+        codes, uniques = pd.factorize(series)
+        # Missing titles get code -1, which picks the trailing 'Unclassified Security'
+        categories = np.empty(len(uniques) + 1, dtype=object)
+        categories[-1] = 'Unclassified Security'
+        categorize = self._categorize_single
+        for i, title in enumerate(uniques):
+            categories[i] = categorize(title)
+        if as_categorical:
+            labels, label_codes = np.unique(categories, return_inverse=True)
+            return pd.Series(pd.Categorical.from_codes(label_codes[codes], categories=labels),
+                             index=series.index, name=series.name)
+        return pd.Series(categories[codes], index=series.index, name=series.name)
     
     def _categorize_single(self, title):
         """Categorize a single security title"""
         if pd.isna(title):
             return 'Unclassified Security'
             
-        title_norm = self.normalize_title(title)
+        return self._categorize_normalized(self.normalize_title(title))
+    
+    @staticmethod
+    @lru_cache(maxsize=100_000)
+    def _categorize_normalized(title_norm):
+        """Categorize a normalized title (cached: titles repeat across files)"""
         
         # Expiring securities
         if '*W EXP' in title_norm or 'RIGHT' in title_norm and '99/99' not in title_norm: